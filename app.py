@@ -7,34 +7,144 @@ Production version for web deployment
 import sqlite3
 import csv
 import os
+import sys
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file
+from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file, g
+from flask_caching import Cache
 import unicodedata
 import re
+from functools import lru_cache
+from collections import defaultdict
+from urllib.request import pathname2url
 
 app = Flask(__name__)
 
 # Production configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'conference-booth-2025-change-in-production')
 
+# In-process cache for the school list and search results
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+SEARCH_CACHE_TIMEOUT = 60
+
 # Paths - configurable for production
 DATA_DIR = os.environ.get('DATA_DIR', 'data')
 DISSERTATIONS_CSV = os.path.join(DATA_DIR, 'dissertations.csv')
 CORRECTIONS_LOG = os.path.join(DATA_DIR, 'corrections_log.csv')
 DB_PATH = os.path.join(DATA_DIR, 'genealogy.db')
 
+# Number of dissertation rows buffered before each bulk insert
+INSERT_BATCH_SIZE = 10000
+
+# Maximum bound parameters per query (SQLite's historical default limit is 999)
+MAX_SQL_VARIABLES = 900
+
+# CSV column names for Advisor_1 through Advisor_8: (id, name, role, number)
+ADVISOR_KEYS = tuple(
+    (f'Advisor_ID_{i}', f'Advisor_Name_{i}', f'Advisor_Role_{i}', i)
+    for i in range(1, 9)
+)
+
+# SQL run on hot paths. sqlite3 reuses a connection's prepared statement
+# when it sees the same SQL text again.
+SQL_INSERT_DISSERTATION = '''
+    INSERT OR IGNORE INTO dissertations 
+    (dissertation_id, author_id, author_name, title, year, school, school_id, department, subject_broad)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_INSERT_ADVISOR = '''
+    INSERT INTO advisors 
+    (dissertation_id, advisor_id, advisor_name, advisor_role, advisor_number)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+SQL_SELECT_PERSON = 'SELECT name, years FROM people WHERE person_id = ?'
+
+# Descendants of a person and how many generations deep they go.
+# `descendants` holds each person once; UNION on the ID alone drops repeats,
+# which also ends cycles. A person's generation is their shortest advisor
+# chain from the starting person. No shortest chain is longer than the
+# number of descendants, so `generations` is capped there.
+SQL_COUNT_DESCENDANTS = '''
+    WITH RECURSIVE descendants(person_id) AS (
+        SELECT d.author_id
+        FROM advisors a
+        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+        WHERE a.advisor_id = :person_id
+          AND d.author_id != '' AND d.author_id != :person_id
+        UNION
+        SELECT d.author_id
+        FROM descendants
+        JOIN advisors a ON a.advisor_id = descendants.person_id
+        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+        WHERE d.author_id != '' AND d.author_id != :person_id
+    ),
+    generations(person_id, depth) AS (
+        SELECT d.author_id, 1
+        FROM advisors a
+        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+        WHERE a.advisor_id = :person_id
+          AND d.author_id != '' AND d.author_id != :person_id
+        UNION
+        SELECT d.author_id, generations.depth + 1
+        FROM generations
+        JOIN advisors a ON a.advisor_id = generations.person_id
+        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+        WHERE d.author_id != '' AND d.author_id != :person_id
+          AND generations.depth < (SELECT COUNT(*) FROM descendants)
+    )
+    SELECT
+        (SELECT COUNT(*) FROM descendants),
+        COALESCE((
+            SELECT MAX(depth)
+            FROM (SELECT MIN(depth) AS depth FROM generations GROUP BY person_id)
+        ), 0)
+'''
+
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
+_normalize = unicodedata.normalize
+_is_normalized = unicodedata.is_normalized
+
+# Translation table deleting every combining mark (category Mn)
+_COMBINING_MARKS = {
+    codepoint: None
+    for codepoint in range(sys.maxunicode + 1)
+    if unicodedata.category(chr(codepoint)) == 'Mn'
+}
+
+
 def normalize_search_text(text):
     """Remove diacritics and convert to lowercase for search matching."""
     if not text:
         return ""
-    # Normalize to NFD (decomposed form) and remove combining characters
-    nfd = unicodedata.normalize('NFD', text)
-    without_diacritics = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-    return without_diacritics.lower().strip()
+    # ASCII text has no diacritics to strip
+    if text.isascii():
+        return text.lower().strip()
+    # Normalize to NFD (decomposed form) and remove combining characters.
+    # The quick check skips decomposition for text that is already NFD.
+    nfd = text if _is_normalized('NFD', text) else _normalize('NFD', text)
+    return nfd.translate(_COMBINING_MARKS).lower().strip()
+
+
+def insert_dissertation_rows(c, diss_rows, adv_rows):
+    """Bulk insert queued dissertation and advisor rows."""
+    c.executemany(SQL_INSERT_DISSERTATION, diss_rows)
+    c.executemany(SQL_INSERT_ADVISOR, adv_rows)
+
+
+def create_indexes(c):
+    """Create indexes for faster searches."""
+    c.execute('CREATE INDEX idx_schools_normalized ON schools(school_name_normalized)')
+    c.execute('CREATE INDEX idx_advisors_advisor_id ON advisors(advisor_id)')
+    c.execute('CREATE INDEX idx_advisors_dissertation_id ON advisors(dissertation_id)')
+    # Covers the affiliation lookup so it never touches the table itself
+    c.execute('CREATE INDEX idx_diss_author ON dissertations(author_id, school_id, school, year)')
+    # Both legs of the school search's "school_id = ? OR school = ?" need an index
+    c.execute('CREATE INDEX idx_diss_school ON dissertations(school_id, school)')
+    c.execute('CREATE INDEX idx_diss_school_name ON dissertations(school)')
 
 
 def init_database():
@@ -43,17 +153,38 @@ def init_database():
     
     # Only initialize if database doesn't exist OR if explicitly requested
     if os.path.exists(DB_PATH) and not os.environ.get('FORCE_REINIT'):
-        print(f"Database already exists at {DB_PATH}. Skipping initialization.")
-        print("Set FORCE_REINIT=1 environment variable to force re-initialization.")
-        return
+        conn = sqlite3.connect(DB_PATH)
+        has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'people_fts'").fetchone()
+        conn.close()
+        
+        if has_fts:
+            print(f"Database already exists at {DB_PATH}. Skipping initialization.")
+            print("Set FORCE_REINIT=1 environment variable to force re-initialization.")
+            return
+        
+        # Databases built before name search moved to FTS5 can't be searched
+        print("Database has no people_fts table. Rebuilding...")
     
     print("Initializing database...")
     
-    # Remove old database if exists
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
+    # Descendant counts computed against the old data are no longer valid
+    get_descendants_count_cached.cache_clear()
+    
+    # Build into a separate file and move it into place only once it is
+    # complete, so a crash mid-load never leaves a partial database at DB_PATH
+    build_path = DB_PATH + '.building'
+    if os.path.exists(build_path):
+        os.remove(build_path)
+    
+    conn = sqlite3.connect(build_path)
+    
+    # Bulk-load tuning: a failed build is discarded and redone on the next
+    # start, so journaling and fsync can be skipped during ingest
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-200000')
     
-    conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     
     # Create tables
@@ -61,8 +192,7 @@ def init_database():
         CREATE TABLE people (
             person_id TEXT PRIMARY KEY,
             name TEXT NOT NULL,
-            years TEXT,
-            name_normalized TEXT
+            years TEXT
         )
     ''')
     
@@ -102,11 +232,14 @@ def init_database():
         )
     ''')
     
-    # Create indexes for faster searches
-    c.execute('CREATE INDEX idx_people_normalized ON people(name_normalized)')
-    c.execute('CREATE INDEX idx_schools_normalized ON schools(school_name_normalized)')
-    c.execute('CREATE INDEX idx_advisors_advisor_id ON advisors(advisor_id)')
-    c.execute('CREATE INDEX idx_advisors_dissertation_id ON advisors(dissertation_id)')
+    c.execute('''
+        CREATE VIRTUAL TABLE people_fts USING fts5(
+            name,
+            content='people',
+            content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
     
     conn.commit()
     
@@ -114,7 +247,9 @@ def init_database():
     if not os.path.exists(DISSERTATIONS_CSV):
         print(f"Warning: {DISSERTATIONS_CSV} not found. Database created but empty.")
         print(f"Please upload your dissertations.csv file to the {DATA_DIR} directory.")
+        create_indexes(c)
         conn.close()
+        os.replace(build_path, DB_PATH)
         return
     
     print(f"Loading data from {DISSERTATIONS_CSV}...")
@@ -128,30 +263,67 @@ def init_database():
         delimiter = '\t' if first_line.count('\t') > first_line.count(',') else ','
         print(f"Detected delimiter: {'TAB' if delimiter == chr(9) else 'COMMA'}")
     
+    diss_rows = []
+    adv_rows = []
+    
+    # Load everything in a single transaction
+    c.execute('BEGIN')
+    
     with open(DISSERTATIONS_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f, delimiter=delimiter)
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+        
+        # Resolve column positions once. Columns missing from the header
+        # read the blank value appended to the end of every row.
+        columns = {name: index for index, name in enumerate(header)}
+        
+        def col(name):
+            return columns.get(name, -1)
+        
+        col_id = col('ID')
+        col_author_id = col('Author_ID')
+        col_author_name = col('Author_Name')
+        col_years = col('Years')
+        col_title = col('Title')
+        col_year = col('Year')
+        col_school = col('School')
+        col_school_id = col('School_ID')
+        col_department = col('Department')
+        col_subject = col('Subject_broad')
+        advisor_cols = tuple(
+            (col(id_key), col(name_key), col(role_key), i)
+            for id_key, name_key, role_key, i in ADVISOR_KEYS
+        )
+        
+        row_width = len(header)
         
         row_count = 0
         for row in reader:
+            if not row:
+                continue
             row_count += 1
             
+            # Pad short rows so every column index is valid
+            if len(row) < row_width:
+                row.extend([''] * (row_width - len(row)))
+            row.append('')
+            
             # Add author to people
-            author_id = row.get('Author_ID', '').strip()
-            author_name = row.get('Author_Name', '').strip()
-            years = row.get('Years', '').strip()
+            author_id = row[col_author_id].strip()
+            author_name = row[col_author_name].strip()
+            years = row[col_years].strip()
             
             if author_id and author_name:
                 if author_id not in people_dict:
                     people_dict[author_id] = {
                         'person_id': author_id,
                         'name': author_name,
-                        'years': years,
-                        'name_normalized': normalize_search_text(author_name)
+                        'years': years
                     }
             
             # Add school
-            school_id = row.get('School_ID', '').strip()
-            school_name = row.get('School', '').strip()
+            school_id = row[col_school_id].strip()
+            school_name = row[col_school].strip()
             
             if school_id and school_name:
                 if school_id not in schools_dict:
@@ -161,68 +333,73 @@ def init_database():
                         'school_name_normalized': normalize_search_text(school_name)
                     }
             
-            # Add advisors to people
-            for i in range(1, 9):  # Advisor_1 through Advisor_8
-                advisor_id = row.get(f'Advisor_ID_{i}', '').strip()
-                advisor_name = row.get(f'Advisor_Name_{i}', '').strip()
-                
-                if advisor_id and advisor_name and advisor_id != 'na':
-                    if advisor_id not in people_dict:
-                        people_dict[advisor_id] = {
-                            'person_id': advisor_id,
-                            'name': advisor_name,
-                            'years': '',
-                            'name_normalized': normalize_search_text(advisor_name)
-                        }
-            
-            # Insert dissertation
-            dissertation_id = row.get('ID', '').strip()
+            # Queue dissertation
+            dissertation_id = row[col_id].strip()
             if dissertation_id:
-                c.execute('''
-                    INSERT OR IGNORE INTO dissertations 
-                    (dissertation_id, author_id, author_name, title, year, school, school_id, department, subject_broad)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                diss_rows.append((
                     dissertation_id,
                     author_id,
                     author_name,
-                    row.get('Title', '').strip(),
-                    row.get('Year', '').strip(),
+                    row[col_title].strip(),
+                    row[col_year].strip(),
                     school_name,
                     school_id,
-                    row.get('Department', '').strip(),
-                    row.get('Subject_broad', '').strip()
+                    row[col_department].strip(),
+                    row[col_subject].strip()
                 ))
+            
+            # Add advisors to people and queue advisor relationships
+            for id_col, name_col, role_col, i in advisor_cols:
+                advisor_id = row[id_col].strip()
+                if not advisor_id or advisor_id == 'na':
+                    continue
+                
+                advisor_name = row[name_col].strip()
+                
+                if advisor_name and advisor_id not in people_dict:
+                    people_dict[advisor_id] = {
+                        'person_id': advisor_id,
+                        'name': advisor_name,
+                        'years': ''
+                    }
                 
-                # Insert advisor relationships
-                for i in range(1, 9):
-                    advisor_id = row.get(f'Advisor_ID_{i}', '').strip()
-                    advisor_name = row.get(f'Advisor_Name_{i}', '').strip()
-                    advisor_role = row.get(f'Advisor_Role_{i}', '').strip()
-                    
-                    if advisor_id and advisor_id != 'na':
-                        c.execute('''
-                            INSERT INTO advisors 
-                            (dissertation_id, advisor_id, advisor_name, advisor_role, advisor_number)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (dissertation_id, advisor_id, advisor_name, advisor_role, i))
+                if dissertation_id:
+                    advisor_role = row[role_col].strip()
+                    adv_rows.append((dissertation_id, advisor_id, advisor_name, advisor_role, i))
+            
+            # Flush queued rows in batches to keep memory bounded
+            if len(diss_rows) >= INSERT_BATCH_SIZE:
+                insert_dissertation_rows(c, diss_rows, adv_rows)
+                diss_rows.clear()
+                adv_rows.clear()
+    
+    # Flush remaining rows
+    insert_dissertation_rows(c, diss_rows, adv_rows)
     
     # Insert all people
-    for person_data in people_dict.values():
-        c.execute('''
-            INSERT OR IGNORE INTO people (person_id, name, years, name_normalized)
-            VALUES (?, ?, ?, ?)
-        ''', (person_data['person_id'], person_data['name'], person_data['years'], person_data['name_normalized']))
+    c.executemany('''
+        INSERT OR IGNORE INTO people (person_id, name, years)
+        VALUES (?, ?, ?)
+    ''', [(p['person_id'], p['name'], p['years']) for p in people_dict.values()])
+    
+    # Full-text index over names for search
+    c.execute('INSERT INTO people_fts(rowid, name) SELECT rowid, name FROM people')
     
     # Insert all schools
-    for school_data in schools_dict.values():
-        c.execute('''
-            INSERT OR IGNORE INTO schools (school_id, school_name, school_name_normalized)
-            VALUES (?, ?, ?)
-        ''', (school_data['school_id'], school_data['school_name'], school_data['school_name_normalized']))
+    c.executemany('''
+        INSERT OR IGNORE INTO schools (school_id, school_name, school_name_normalized)
+        VALUES (?, ?, ?)
+    ''', [(s['school_id'], s['school_name'], s['school_name_normalized']) for s in schools_dict.values()])
     
     conn.commit()
     
+    # Build indexes once over the loaded tables rather than per insert
+    create_indexes(c)
+    
+    # Restore durable writes now that the bulk load is done
+    conn.execute('PRAGMA journal_mode=DELETE')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    
     # Print stats
     c.execute('SELECT COUNT(*) FROM people')
     people_count = c.fetchone()[0]
@@ -235,6 +412,7 @@ def init_database():
     print(f"Processed {row_count} rows from CSV")
     
     conn.close()
+    os.replace(build_path, DB_PATH)
 
 
 def log_correction(user_name, action_type, record_id, details):
@@ -256,92 +434,168 @@ def log_correction(user_name, action_type, record_id, details):
         ])
 
 
-def get_person_affiliations(person_id):
-    """Get all university affiliations for a person (as student and/or faculty)."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    affiliations = {}
-    
-    # Where they were a student
-    c.execute('''
-        SELECT DISTINCT school, school_id, year
-        FROM dissertations
-        WHERE author_id = ?
-    ''', (person_id,))
-    
-    for school, school_id, year in c.fetchall():
-        if school:
-            key = school_id if school_id else school
-            if key not in affiliations:
-                affiliations[key] = {
-                    'school': school,
-                    'student': True,
-                    'faculty': False,
-                    'year': year
-                }
-    
-    # Where they were faculty (advised students)
-    c.execute('''
-        SELECT DISTINCT d.school, d.school_id
-        FROM advisors a
-        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
-        WHERE a.advisor_id = ?
-    ''', (person_id,))
-    
-    for school, school_id in c.fetchall():
-        if school:
-            key = school_id if school_id else school
-            if key not in affiliations:
-                affiliations[key] = {
-                    'school': school,
-                    'student': False,
-                    'faculty': True,
-                    'year': None
-                }
-            else:
-                affiliations[key]['faculty'] = True
-    
-    conn.close()
-    return list(affiliations.values())
+def get_db():
+    """Get the read-only database connection for the current request."""
+    db = getattr(g, '_db', None)
+    if db is None:
+        db = g._db = sqlite3.connect(f'file:{pathname2url(DB_PATH)}?mode=ro&cache=shared', uri=True)
+        db.row_factory = sqlite3.Row
+        # Reads are random page lookups - serve them from a memory mapping
+        db.execute('PRAGMA mmap_size=268435456')
+        db.execute('PRAGMA cache_size=-65536')
+        db.execute('PRAGMA query_only=ON')
+    return db
 
 
-def get_descendants_count(person_id, visited=None):
-    """Recursively count all descendants and max generation depth."""
-    if visited is None:
-        visited = set()
-    
-    if person_id in visited:
-        return 0, 0
-    
-    visited.add(person_id)
-    
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+@app.teardown_appcontext
+def close_db(exception):
+    """Close the request's database connection, if one was opened."""
+    db = g.pop('_db', None)
+    if db is not None:
+        db.close()
+
+
+def get_affiliations(c, person_ids):
+    """Get university affiliations for several people at once, keyed by person ID."""
+    affiliations = defaultdict(list)
     
-    # Get direct students
-    c.execute('''
-        SELECT DISTINCT d.author_id
-        FROM advisors a
-        JOIN dissertations d ON a.dissertation_id = d.dissertation_id
-        WHERE a.advisor_id = ?
-    ''', (person_id,))
+    for start in range(0, len(person_ids), MAX_SQL_VARIABLES):
+        chunk = person_ids[start:start + MAX_SQL_VARIABLES]
+        placeholders = ', '.join(['(?)'] * len(chunk))
+        
+        # Where they were a student and where they were faculty (advised
+        # students), merged per school. Student affiliations are listed first,
+        # each group in CSV order.
+        # The IDs are bound once and shared by both legs of the union.
+        c.execute(f'''
+            WITH ids(person_id) AS (VALUES {placeholders})
+            SELECT person_id, MIN(school), MAX(is_student), MAX(is_faculty), MIN(NULLIF(year, ''))
+            FROM (
+                SELECT author_id AS person_id, school, school_id, year,
+                       1 AS is_student, 0 AS is_faculty, rowid AS csv_order
+                FROM dissertations
+                WHERE author_id IN ids
+                UNION ALL
+                SELECT a.advisor_id, d.school, d.school_id, NULL, 0, 1, d.rowid
+                FROM advisors a
+                JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+                WHERE a.advisor_id IN ids
+            )
+            WHERE school != ''
+            GROUP BY person_id, COALESCE(NULLIF(school_id, ''), school)
+            ORDER BY MAX(is_student) DESC,
+                     COALESCE(MIN(CASE WHEN is_student = 1 THEN csv_order END), MIN(csv_order))
+        ''', chunk)
+        
+        for person_id, school, student, faculty, year in c.fetchall():
+            affiliations[person_id].append({
+                'school': school,
+                'student': bool(student),
+                'faculty': bool(faculty),
+                'year': year
+            })
     
-    students = [row[0] for row in c.fetchall() if row[0]]
-    conn.close()
+    return {person_id: affiliations[person_id] for person_id in person_ids}
+
+
+def get_person_affiliations(person_id):
+    """Get all university affiliations for a person (as student and/or faculty)."""
+    return get_affiliations(get_db().cursor(), [person_id])[person_id]
+
+
+def get_descendants_count(c, person_id):
+    """Count all descendants and max generation depth."""
+    c.execute(SQL_COUNT_DESCENDANTS, {'person_id': person_id})
+    total_descendants, max_depth = c.fetchone()
+    return total_descendants, max_depth
+
+
+@lru_cache(maxsize=16384)
+def get_descendants_count_cached(person_id):
+    """Memoized get_descendants_count for the current database."""
+    return get_descendants_count(get_db().cursor(), person_id)
+
+
+@cache.memoize(timeout=SEARCH_CACHE_TIMEOUT)
+def find_people(name_query, school_query):
+    """Find people by name or university. Returns None if the university is not found."""
+    c = get_db().cursor()
     
-    if not students:
-        return 0, 0
+    results = []
     
-    total_descendants = len(students)
-    max_depth = 1
+    if name_query:
+        # Search by name - match each word as a prefix, in any order, so
+        # "Ronald Numbers" finds "Numbers, Ronald"
+        name_parts = re.findall(r'\w+', normalize_search_text(name_query))
+        
+        if name_parts:
+            match_query = ' '.join(f'"{part}"*' for part in name_parts)
+            
+            c.execute('''
+                SELECT p.person_id, p.name, p.years
+                FROM people_fts f
+                JOIN people p ON p.rowid = f.rowid
+                WHERE people_fts MATCH ?
+                ORDER BY p.name
+            ''', (match_query,))
+            
+            people_rows = c.fetchall()
+            affiliations = get_affiliations(c, [row[0] for row in people_rows])
+            for person_id, name, years in people_rows:
+                results.append({
+                    'person_id': person_id,
+                    'name': name,
+                    'years': years,
+                    'affiliations': affiliations[person_id]
+                })
     
-    for student_id in students:
-        descendant_count, depth = get_descendants_count(student_id, visited)
-        total_descendants += descendant_count
-        max_depth = max(max_depth, depth + 1)
+    elif school_query:
+        # Search by university - get all people associated with that school
+        school_normalized = normalize_search_text(school_query)
+        
+        # Get school_id
+        c.execute('''
+            SELECT school_id, school_name
+            FROM schools
+            WHERE school_name_normalized LIKE ?
+            LIMIT 1
+        ''', (f'%{school_normalized}%',))
+        
+        school_row = c.fetchone()
+        if not school_row:
+            return None
+        
+        school_id, school_name = school_row
+        
+        # Get all people who studied or taught there
+        c.execute('''
+            SELECT p.person_id, p.name, p.years
+            FROM people p
+            WHERE p.person_id IN (
+                SELECT author_id
+                FROM dissertations
+                WHERE school_id = ? OR school = ?
+                UNION
+                SELECT a.advisor_id
+                FROM advisors a
+                JOIN dissertations d ON a.dissertation_id = d.dissertation_id
+                WHERE d.school_id = ? OR d.school = ?
+            )
+            ORDER BY p.name, p.person_id
+        ''', (school_id, school_name, school_id, school_name))
+        
+        for person_id, name, years in c.fetchall():
+            results.append({
+                'person_id': person_id,
+                'name': name,
+                'years': years
+            })
+        
+        affiliations = get_affiliations(c, [result['person_id'] for result in results])
+        for result in results:
+            result['affiliations'] = affiliations[result['person_id']]
     
-    return total_descendants, max_depth
+    return results
 
 
 # Routes
@@ -357,11 +611,9 @@ def health():
     """Health check endpoint for monitoring."""
     try:
         # Check database connectivity
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
+        c = get_db().cursor()
         c.execute('SELECT COUNT(*) FROM people')
         count = c.fetchone()[0]
-        conn.close()
         
         return jsonify({
             'status': 'healthy',
@@ -376,13 +628,12 @@ def health():
 
 
 @app.route('/api/schools')
+@cache.cached()
 def get_schools():
     """API endpoint for school autocomplete."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    c = get_db().cursor()
     c.execute('SELECT DISTINCT school_name FROM schools ORDER BY school_name')
     schools = [row[0] for row in c.fetchall()]
-    conn.close()
     return jsonify(schools)
 
 
@@ -395,125 +646,9 @@ def search():
     if not name_query and not school_query:
         return render_template('search.html', error="Please enter a name or university")
     
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    results = []
-    
-    if name_query:
-        # Search by name - split into parts to match "Ronald Numbers" with "Numbers, Ronald"
-        name_normalized = normalize_search_text(name_query)
-        
-        # Split into individual words and filter out empty strings
-        name_parts = [part.strip() for part in name_normalized.split() if part.strip()]
-        
-        if name_parts:
-            try:
-                # Build query to match all parts (in any order)
-                where_clauses = []
-                params = []
-                for part in name_parts:
-                    where_clauses.append('name_normalized LIKE ?')
-                    params.append(f'%{part}%')
-                
-                query = f'''
-                    SELECT person_id, name, years
-                    FROM people
-                    WHERE {' AND '.join(where_clauses)}
-                    ORDER BY name
-                '''
-                
-                c.execute(query, tuple(params))
-                
-                for person_id, name, years in c.fetchall():
-                    affiliations = get_person_affiliations(person_id)
-                    results.append({
-                        'person_id': person_id,
-                        'name': name,
-                        'years': years,
-                        'affiliations': affiliations
-                    })
-            except Exception as e:
-                # Log error and fall back to simple search
-                print(f"Search error: {e}")
-                # Fallback to original simple search
-                c.execute('''
-                    SELECT person_id, name, years
-                    FROM people
-                    WHERE name_normalized LIKE ?
-                    ORDER BY name
-                ''', (f'%{name_normalized}%',))
-                
-                for person_id, name, years in c.fetchall():
-                    affiliations = get_person_affiliations(person_id)
-                    results.append({
-                        'person_id': person_id,
-                        'name': name,
-                        'years': years,
-                        'affiliations': affiliations
-                    })
-    
-    elif school_query:
-        # Search by university - get all people associated with that school
-        school_normalized = normalize_search_text(school_query)
-        
-        # Get school_id
-        c.execute('''
-            SELECT school_id, school_name
-            FROM schools
-            WHERE school_name_normalized LIKE ?
-            LIMIT 1
-        ''', (f'%{school_normalized}%',))
-        
-        school_row = c.fetchone()
-        if not school_row:
-            conn.close()
-            return render_template('search.html', error="University not found")
-        
-        school_id, school_name = school_row
-        
-        # Get all people who studied or taught there
-        people_ids = set()
-        
-        # Students
-        c.execute('''
-            SELECT DISTINCT author_id
-            FROM dissertations
-            WHERE school_id = ? OR school = ?
-        ''', (school_id, school_name))
-        
-        for row in c.fetchall():
-            if row[0]:
-                people_ids.add(row[0])
-        
-        # Faculty
-        c.execute('''
-            SELECT DISTINCT a.advisor_id
-            FROM advisors a
-            JOIN dissertations d ON a.dissertation_id = d.dissertation_id
-            WHERE d.school_id = ? OR d.school = ?
-        ''', (school_id, school_name))
-        
-        for row in c.fetchall():
-            if row[0]:
-                people_ids.add(row[0])
-        
-        # Get details for all people
-        for person_id in people_ids:
-            c.execute('SELECT name, years FROM people WHERE person_id = ?', (person_id,))
-            person_row = c.fetchone()
-            if person_row:
-                affiliations = get_person_affiliations(person_id)
-                results.append({
-                    'person_id': person_id,
-                    'name': person_row[0],
-                    'years': person_row[1],
-                    'affiliations': affiliations
-                })
-        
-        results.sort(key=lambda x: x['name'])
-    
-    conn.close()
+    results = find_people(name_query, school_query)
+    if results is None:
+        return render_template('search.html', error="University not found")
     
     return render_template('search.html', results=results, name_query=name_query, school_query=school_query)
 
@@ -521,15 +656,13 @@ def search():
 @app.route('/person/<person_id>')
 def person_detail(person_id):
     """Show detailed genealogy page for a person."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    c = get_db().cursor()
     
     # Get person details
-    c.execute('SELECT name, years FROM people WHERE person_id = ?', (person_id,))
+    c.execute(SQL_SELECT_PERSON, (person_id,))
     person_row = c.fetchone()
     
     if not person_row:
-        conn.close()
         return "Person not found", 404
     
     person_name, years = person_row
@@ -539,6 +672,7 @@ def person_detail(person_id):
         SELECT title, year, school, department, subject_broad, dissertation_id
         FROM dissertations
         WHERE author_id = ?
+        ORDER BY rowid
     ''', (person_id,))
     
     diss_row = c.fetchone()
@@ -591,10 +725,8 @@ def person_detail(person_id):
             'school': school or 'Unknown'
         })
     
-    conn.close()
-    
     # Calculate genealogy stats
-    total_descendants, max_generations = get_descendants_count(person_id)
+    total_descendants, max_generations = get_descendants_count_cached(person_id)
     direct_students = len(students)
     
     affiliations = get_person_affiliations(person_id)
@@ -639,15 +771,13 @@ def edit_person(person_id):
         return redirect(url_for('person_detail', person_id=person_id))
     
     # GET request - show edit form
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    c = get_db().cursor()
     
     # Get person details
-    c.execute('SELECT name, years FROM people WHERE person_id = ?', (person_id,))
+    c.execute(SQL_SELECT_PERSON, (person_id,))
     person_row = c.fetchone()
     
     if not person_row:
-        conn.close()
         return "Person not found", 404
     
     person_name, years = person_row
@@ -657,6 +787,7 @@ def edit_person(person_id):
         SELECT title, year, school, department, subject_broad
         FROM dissertations
         WHERE author_id = ?
+        ORDER BY rowid
     ''', (person_id,))
     
     diss_row = c.fetchone()
@@ -671,8 +802,6 @@ def edit_person(person_id):
             'subject': diss_row[4] or ''
         }
     
-    conn.close()
-    
     return render_template('edit.html',
                          person_id=person_id,
                          person_name=person_name,